@@ -5,18 +5,42 @@ Processes multiple job postings concurrently using asyncio.
 Configurable batch size and concurrency limits to balance speed vs rate limiting.
 """
 import asyncio
+from collections import deque
 from typing import List, Optional
 from dataclasses import dataclass
 import time
 
-from github_scraper import JobPosting, get_job_urls
-from scraper import scrape_page
-from parser import parse_job_text, parse_job_texts_batch
-from db import save_job_data, init_db, save_failed_url
+import httpx
+import xxhash
+
+# uvloop (Linux/macOS) cuts per-socket scheduling overhead for the many
+# concurrent HTTPS requests this pipeline runs; fall back to the default
+# loop where it isn't available (e.g. Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+from github_scraper import JobPosting, get_job_urls, dedupe_jobs
+from scraper import scrape_page, close_crawler
+from parser import (parse_job_text_async, parse_job_texts_batch_stream,
+                    extract_main_content)
+from db import (save_jobs_bulk, init_db, save_failed_url, refresh_skill_counts,
+                get_parsed_by_hash, save_parse_cache)
 from job_tracker import filter_new_jobs, print_stats
 
 
-@dataclass
+def content_hash(text: str) -> str:
+    """
+    Parse-cache key: xxh128 over the whitespace-normalized text, so
+    mirrors of the same posting that differ only in formatting (Workday
+    mirrors, Simplify proxies) still hit the cache.
+    """
+    return xxhash.xxh128(' '.join(text.split())).hexdigest()
+
+
+@dataclass(slots=True)
 class ProcessResult:
     """Result of processing a single job."""
     job: JobPosting
@@ -25,102 +49,318 @@ class ProcessResult:
     parsed_data: Optional[dict] = None
 
 
+class Throttler:
+    """
+    Sliding-window token bucket: allows at most rate_limit requests per
+    period seconds, evaluated per request. Unlike a fixed sleep between
+    batches, fast requests don't leave capacity idle.
+
+    Usage: async with throttler: await scrape(...)
+    """
+
+    def __init__(self, rate_limit: float, period: float = 1.0):
+        self.rate_limit = rate_limit
+        self.period = period
+        self._timestamps = deque()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            # Drop timestamps that have slid out of the window
+            while self._timestamps and now - self._timestamps[0] > self.period:
+                self._timestamps.popleft()
+
+            if len(self._timestamps) < self.rate_limit:
+                self._timestamps.append(now)
+                return
+
+            # Wait until the oldest request leaves the window
+            await asyncio.sleep(self.period - (now - self._timestamps[0]))
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class AdaptiveLimiter:
+    """
+    Self-tuning concurrency gate. Starts at the configured limit, then
+    every ADJUST_EVERY completions: widens by one while the error rate
+    stays under 2%, halves on an error rate over 5% (429s, timeouts).
+    A fixed limit is either wasting bandwidth or getting rate-limited;
+    this tracks whatever the target sites will actually sustain.
+
+    Usage: async with limiter: ... ; await limiter.on_result(success)
+    """
+
+    MIN_LIMIT = 2
+    MAX_LIMIT = 64
+    ADJUST_EVERY = 20
+
+    def __init__(self, limit: int):
+        self.limit = max(self.MIN_LIMIT, min(limit, self.MAX_LIMIT))
+        self._active = 0
+        self._cond = asyncio.Condition()
+        self._completions = 0
+        self._errors = 0
+
+    async def __aenter__(self):
+        async with self._cond:
+            while self._active >= self.limit:
+                await self._cond.wait()
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    async def on_result(self, success: bool):
+        """Feed one completion into the controller and adjust the limit."""
+        async with self._cond:
+            self._completions += 1
+            if not success:
+                self._errors += 1
+            if self._completions < self.ADJUST_EVERY:
+                return
+
+            error_rate = self._errors / self._completions
+            if error_rate > 0.05:
+                self.limit = max(self.MIN_LIMIT, self.limit // 2)
+                print(f"   ⚠️  Error rate {error_rate:.0%} - concurrency down to {self.limit}")
+            elif error_rate < 0.02 and self.limit < self.MAX_LIMIT:
+                self.limit += 1
+                self._cond.notify_all()
+
+            self._completions = 0
+            self._errors = 0
+
+
 class BatchProcessor:
     """
     Processes job postings in batches with configurable concurrency.
     
     Args:
         max_concurrent: Maximum number of concurrent scraping tasks (default: 5)
-        delay_between_batches: Seconds to wait between batches (default: 2)
+        max_rps: Maximum scrape requests per second across all workers (default: 5)
+        keep_parsed_data: If True, retain parsed skill dicts on ProcessResult
+            after they're saved. Off by default so long runs don't hold every
+            parsed job in RAM.
     """
-    
-    def __init__(self, max_concurrent: int = 5, delay_between_batches: float = 2.0):
+
+    def __init__(self, max_concurrent: int = 5, max_rps: float = 5.0,
+                 keep_parsed_data: bool = False):
         self.max_concurrent = max_concurrent
-        self.delay_between_batches = delay_between_batches
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        
+        self.keep_parsed_data = keep_parsed_data
+
+        # Concurrency adapts to observed error rate, starting from
+        # max_concurrent; workers block here when the limit shrinks
+        self.limiter = AdaptiveLimiter(max_concurrent)
+
+        # Per-request rate limiting (replaces the old fixed sleep between
+        # batches, which wasted capacity whenever requests finished early)
+        self.throttler = Throttler(rate_limit=max_rps, period=1.0)
+
+        # Shared HTTP client: one connection pool for the whole run, so repeat
+        # hosts (company ATS domains) reuse TCP/TLS connections
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=True,
+            timeout=30
+        )
+
+        # Parsed jobs waiting to be written; flushed in one transaction
+        # once the buffer fills (or at the end of a run)
+        self.pending_writes: list[dict] = []
+        self.write_lock = asyncio.Lock()
+        self.flush_threshold = 25
+
         # Stats
         self.processed = 0
         self.succeeded = 0
         self.failed = 0
-    
+
+    async def _queue_write(self, parsed: dict):
+        """Buffer a parsed job for the next bulk DB write."""
+        async with self.write_lock:
+            self.pending_writes.append(parsed)
+            if len(self.pending_writes) >= self.flush_threshold:
+                await self._flush()
+
+    async def _flush(self):
+        """Write all buffered jobs in one transaction. Caller holds write_lock."""
+        if not self.pending_writes:
+            return
+        batch, self.pending_writes = self.pending_writes, []
+        await asyncio.to_thread(save_jobs_bulk, batch)
+
+    async def flush_writes(self):
+        """Flush any buffered jobs to the database."""
+        async with self.write_lock:
+            await self._flush()
+
+    async def aclose(self):
+        """Flush pending writes, then close the shared HTTP client and
+        the shared browser (if any scrape fell back to it)."""
+        await self.flush_writes()
+        await self.client.aclose()
+        await close_crawler()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def _save_parsed_job(self, job: JobPosting, parsed: dict) -> ProcessResult:
+        """
+        Enrich a parsed job with the GitHub listing's metadata and queue
+        it for the next bulk DB write.
+        """
+        if not parsed.get('job_title') or parsed.get('job_title') == 'null':
+            parsed['job_title'] = job.role
+        if not parsed.get('company') or parsed.get('company') == 'null':
+            parsed['company'] = job.company
+
+        parsed['url'] = job.apply_url
+        parsed['location'] = job.location
+
+        # Remove job_id field before saving (it was just for matching)
+        parsed.pop('job_id', None)
+
+        await self._queue_write(parsed)
+        return ProcessResult(
+            job=job,
+            success=True,
+            parsed_data=parsed if self.keep_parsed_data else None
+        )
+
     async def process_single_job(self, job: JobPosting) -> ProcessResult:
         """
         Process a single job posting: scrape -> parse -> save.
-        Uses semaphore to limit concurrency.
+        Concurrency is bounded by the caller (worker pool), not here.
         Failed URLs are saved to avoid retrying them.
         """
-        async with self.semaphore:
-            try:
-                # 1. Scrape the job page
-                html_content = await scrape_page(job.apply_url)
-                
-                if not html_content or len(html_content) < 500:
-                    error_msg = f"Scraping failed or content too short ({len(html_content) if html_content else 0} chars)"
-                    save_failed_url(job.apply_url, error_msg)
-                    return ProcessResult(
-                        job=job,
-                        success=False,
-                        error=error_msg
-                    )
-                
-                # 2. Parse with Gemini
-                parsed = parse_job_text(html_content)
-                
-                if not parsed:
-                    error_msg = "Parsing failed"
-                    save_failed_url(job.apply_url, error_msg)
-                    return ProcessResult(
-                        job=job,
-                        success=False,
-                        error=error_msg
-                    )
-                
-                # 3. Enrich with data from GitHub (in case Gemini missed it)
-                if not parsed.get('job_title') or parsed.get('job_title') == 'null':
-                    parsed['job_title'] = job.role
-                if not parsed.get('company') or parsed.get('company') == 'null':
-                    parsed['company'] = job.company
-                
-                # Add the URL
-                parsed['url'] = job.apply_url
-                parsed['location'] = job.location
-                
-                # 4. Save to database
-                save_job_data(parsed)
-                
+        try:
+            # 1. Scrape the job page
+            async with self.limiter:
+                async with self.throttler:
+                    html_content = await scrape_page(job.apply_url, client=self.client)
+
+            if not html_content or len(html_content) < 500:
+                error_msg = f"Scraping failed or content too short ({len(html_content) if html_content else 0} chars)"
+                await self.limiter.on_result(False)
+                await asyncio.to_thread(save_failed_url, job.apply_url, error_msg)
                 return ProcessResult(
                     job=job,
-                    success=True,
-                    parsed_data=parsed
+                    success=False,
+                    error=error_msg
                 )
-                
-            except Exception as e:
-                error_msg = str(e)
-                save_failed_url(job.apply_url, error_msg)
+            await self.limiter.on_result(True)
+
+            # 2. Boil the page down to its main content, then parse with
+            # Gemini unless an identical page was parsed before (reposted
+            # ads are common) - the LLM call is the most expensive step,
+            # so check the content-hash cache first
+            html_content = await asyncio.to_thread(extract_main_content, html_content)
+            html_hash = content_hash(html_content)
+            parsed = await asyncio.to_thread(get_parsed_by_hash, html_hash)
+
+            if parsed is None:
+                # Coalesced: concurrent single-job parses share one
+                # batched Gemini call instead of one RPC each
+                parsed = await parse_job_text_async(html_content)
+                if parsed:
+                    await asyncio.to_thread(save_parse_cache, html_hash, parsed)
+
+            # Drop the scraped page (can be megabytes) as soon as it's
+            # parsed so it doesn't live for the rest of the task
+            del html_content
+
+            if not parsed:
+                error_msg = "Parsing failed"
+                await asyncio.to_thread(save_failed_url, job.apply_url, error_msg)
                 return ProcessResult(
                     job=job,
                     success=False,
                     error=error_msg
                 )
+
+            # 3. Enrich with data from GitHub (in case Gemini missed it)
+            if not parsed.get('job_title') or parsed.get('job_title') == 'null':
+                parsed['job_title'] = job.role
+            if not parsed.get('company') or parsed.get('company') == 'null':
+                parsed['company'] = job.company
+
+            # Add the URL (dropping any stale batch id left in rows cached
+            # before the batch path stripped it)
+            parsed.pop('job_id', None)
+            parsed['url'] = job.apply_url
+            parsed['location'] = job.location
+
+            # 4. Queue for the next bulk DB write
+            await self._queue_write(parsed)
+
+            return ProcessResult(
+                job=job,
+                success=True,
+                parsed_data=parsed if self.keep_parsed_data else None
+            )
+
+        except Exception as e:
+            error_msg = str(e)
+            await asyncio.to_thread(save_failed_url, job.apply_url, error_msg)
+            return ProcessResult(
+                job=job,
+                success=False,
+                error=error_msg
+            )
     
     async def scrape_single_job(self, job: JobPosting) -> tuple[JobPosting, Optional[str], Optional[str]]:
         """
         Scrape a single job page (no parsing).
         Returns: (job, html_content, error)
         """
-        async with self.semaphore:
-            try:
-                html_content = await scrape_page(job.apply_url)
-                
-                if not html_content or len(html_content) < 500:
-                    error_msg = f"Scraping failed or content too short ({len(html_content) if html_content else 0} chars)"
-                    return (job, None, error_msg)
-                
-                return (job, html_content, None)
-                
-            except Exception as e:
-                return (job, None, str(e))
+        try:
+            async with self.limiter:
+                async with self.throttler:
+                    html_content = await scrape_page(job.apply_url, client=self.client)
+
+            if not html_content or len(html_content) < 500:
+                error_msg = f"Scraping failed or content too short ({len(html_content) if html_content else 0} chars)"
+                await self.limiter.on_result(False)
+                return (job, None, error_msg)
+            await self.limiter.on_result(True)
+
+            # Strip boilerplate here so the batch only holds trimmed text,
+            # not full multi-megabyte pages
+            html_content = await asyncio.to_thread(extract_main_content, html_content)
+            return (job, html_content, None)
+
+        except Exception as e:
+            await self.limiter.on_result(False)
+            return (job, None, str(e))
+
+    async def _scrape_worker(self, queue: asyncio.Queue, to_parse: list, results: list):
+        """
+        Worker coroutine: pull jobs off the queue and scrape them until a
+        None sentinel arrives. Successful scrapes land in to_parse,
+        failures in results.
+        """
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            job, content, error = await self.scrape_single_job(job)
+            if error:
+                await asyncio.to_thread(save_failed_url, job.apply_url, error)
+                results.append(ProcessResult(job=job, success=False, error=error))
+            else:
+                to_parse.append((job, content))
 
     async def process_batch(self, jobs: List[JobPosting]) -> List[ProcessResult]:
         """
@@ -135,64 +375,108 @@ class BatchProcessor:
         print(f"   (Scraping: max {self.max_concurrent} concurrent, Parsing: 1 API call for all)")
         start_time = time.time()
         
-        # Step 1: Scrape all jobs concurrently
-        scrape_tasks = [self.scrape_single_job(job) for job in jobs]
-        scrape_results = await asyncio.gather(*scrape_tasks, return_exceptions=True)
-        
+        # Step 1: Scrape with a fixed pool of worker coroutines pulling from
+        # a bounded queue — constant task-object memory regardless of batch
+        # size, and each result is handled the moment its scrape finishes
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * self.max_concurrent)
+
+        # Enough workers for the limiter to grow into; the limiter gates
+        # how many actually scrape at once
+        worker_count = min(len(jobs), AdaptiveLimiter.MAX_LIMIT)
+
         # Separate successful scrapes from failures
         to_parse = []  # (job, content) tuples
         results = []   # Final results
-        
-        for i, result in enumerate(scrape_results):
-            if isinstance(result, Exception):
-                save_failed_url(jobs[i].apply_url, str(result))
-                results.append(ProcessResult(job=jobs[i], success=False, error=str(result)))
-            else:
-                job, content, error = result
-                if error:
-                    save_failed_url(job.apply_url, error)
-                    results.append(ProcessResult(job=job, success=False, error=error))
-                else:
-                    to_parse.append((job, content))
+
+        # TaskGroup gives deterministic cleanup: if a worker blows up, the
+        # rest are cancelled and the exception propagates instead of being
+        # retained inside a gather() future graph
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(worker_count):
+                tg.create_task(self._scrape_worker(queue, to_parse, results))
+
+            for job in jobs:
+                await queue.put(job)
+            # One shutdown sentinel per worker; the group waits for them
+            for _ in range(worker_count):
+                await queue.put(None)
         
         scrape_success = len(to_parse)
         print(f"   ✓ Scraped: {scrape_success}/{len(jobs)} succeeded")
         
-        # Step 2: Parse all scraped content in ONE API call
+        # Step 2: Parse scraped content - cached pages (identical content
+        # seen before) skip the LLM entirely, the rest go in ONE API call
         if to_parse:
-            # Build input for batch parser: (job_id, text)
-            parse_input = [(str(i), content) for i, (job, content) in enumerate(to_parse)]
-            
-            print(f"   🤖 Parsing {len(parse_input)} jobs in single API call...")
-            parsed_results = parse_job_texts_batch(parse_input)
-            
-            # Create a lookup by job_id
-            parsed_lookup = {str(p.get('job_id', i)): p for i, p in enumerate(parsed_results)}
-            
-            # Step 3: Save results
+            cache_hits = {}  # index -> cached parse
+            to_llm = []        # (index, content) still needing Gemini
+            hashes = []        # index-aligned content hashes
+
             for i, (job, content) in enumerate(to_parse):
-                parsed = parsed_lookup.get(str(i))
-                
+                html_hash = content_hash(content)
+                hashes.append(html_hash)
+                cached = await asyncio.to_thread(get_parsed_by_hash, html_hash)
+                if cached is not None:
+                    cache_hits[i] = cached
+                else:
+                    to_llm.append((str(i), content))
+
+            if cache_hits:
+                print(f"   ✓ Parse cache: {len(cache_hits)}/{len(to_parse)} hits")
+
+            # Jobs already saved while the response was still streaming
+            streamed = set()
+
+            if to_llm:
+                print(f"   🤖 Parsing {len(to_llm)} jobs in single streaming API call...")
+
+                # The sync streaming generator runs in a thread and feeds
+                # parsed jobs through a queue, so caching and DB writes
+                # start the moment Gemini finishes a job instead of
+                # waiting for the slowest one in the batch
+                stream_queue: asyncio.Queue = asyncio.Queue()
+                loop = asyncio.get_running_loop()
+
+                def _produce():
+                    try:
+                        for item in parse_job_texts_batch_stream(to_llm):
+                            loop.call_soon_threadsafe(stream_queue.put_nowait, item)
+                    finally:
+                        loop.call_soon_threadsafe(stream_queue.put_nowait, None)
+
+                producer = asyncio.create_task(asyncio.to_thread(_produce))
+                while True:
+                    p = await stream_queue.get()
+                    if p is None:
+                        break
+                    # Tolerate garbage ids from the model (missing, null,
+                    # non-numeric) instead of aborting the whole run
+                    try:
+                        idx = int(p['job_id'])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if idx in streamed or not 0 <= idx < len(to_parse):
+                        continue
+                    streamed.add(idx)
+                    # Cache the dict without the batch-matching id so a
+                    # later cache hit doesn't carry a stale index along
+                    p.pop('job_id', None)
+                    await asyncio.to_thread(save_parse_cache, hashes[idx], p)
+                    results.append(await self._save_parsed_job(to_parse[idx][0], p))
+                await producer
+
+            # Step 3: Save cache hits, and record anything the stream
+            # never returned as a parse failure
+            for i, (job, content) in enumerate(to_parse):
+                if i in streamed:
+                    continue
+
+                parsed = cache_hits.get(i)
                 if not parsed:
-                    save_failed_url(job.apply_url, "Parsing failed - no result returned")
+                    await asyncio.to_thread(save_failed_url, job.apply_url, "Parsing failed - no result returned")
                     results.append(ProcessResult(job=job, success=False, error="Parsing failed"))
                     continue
-                
-                # Enrich with GitHub data
-                if not parsed.get('job_title') or parsed.get('job_title') == 'null':
-                    parsed['job_title'] = job.role
-                if not parsed.get('company') or parsed.get('company') == 'null':
-                    parsed['company'] = job.company
-                
-                parsed['url'] = job.apply_url
-                parsed['location'] = job.location
-                
-                # Remove job_id field before saving (it was just for matching)
-                parsed.pop('job_id', None)
-                
-                # Save to database
-                save_job_data(parsed)
-                results.append(ProcessResult(job=job, success=True, parsed_data=parsed))
+
+                results.append(await self._save_parsed_job(job, parsed))
         
         # Update stats
         for result in results:
@@ -208,38 +492,54 @@ class BatchProcessor:
         
         return results
     
-    async def process_all(self, jobs: List[JobPosting], batch_size: int = 10) -> List[ProcessResult]:
+    async def iter_results(self, jobs: List[JobPosting], batch_size: int = 10):
         """
-        Process all jobs in batches.
-        
+        Process all jobs in batches, yielding each ProcessResult as its
+        batch completes. Streaming means callers don't have to hold every
+        result for a 10k-job run in memory at once.
+
         Args:
             jobs: List of all job postings
             batch_size: Number of jobs per batch
-            
-        Returns:
-            List of all ProcessResult objects
+
+        Yields:
+            ProcessResult objects, in batch completion order
         """
         print(f"\n{'='*60}")
         print(f"Starting batch processing of {len(jobs)} jobs")
         print(f"   Batch size: {batch_size}, Max concurrent: {self.max_concurrent}")
         print(f"{'='*60}")
-        
-        all_results = []
+
         total_batches = (len(jobs) + batch_size - 1) // batch_size
-        
+
         for i in range(0, len(jobs), batch_size):
             batch_num = i // batch_size + 1
             batch = jobs[i:i + batch_size]
-            
+
             print(f"\nBatch {batch_num}/{total_batches}")
-            results = await self.process_batch(batch)
-            all_results.extend(results)
-            
-            # Delay between batches (except for the last one)
-            if i + batch_size < len(jobs) and self.delay_between_batches > 0:
-                print(f"   Waiting {self.delay_between_batches}s before next batch...")
-                await asyncio.sleep(self.delay_between_batches)
-        
+            for result in await self.process_batch(batch):
+                yield result
+
+    async def process_all(self, jobs: List[JobPosting], batch_size: int = 10) -> List[ProcessResult]:
+        """
+        Process all jobs in batches and collect every result in a list.
+        Convenience wrapper around iter_results; results carry parsed_data
+        only when keep_parsed_data is set, so the list stays small.
+
+        Args:
+            jobs: List of all job postings
+            batch_size: Number of jobs per batch
+
+        Returns:
+            List of all ProcessResult objects
+        """
+        all_results = [r async for r in self.iter_results(jobs, batch_size=batch_size)]
+
+        # Make sure the last partial buffer hits the database, then bring
+        # the precomputed skill counts up to date for the dashboard
+        await self.flush_writes()
+        await asyncio.to_thread(refresh_skill_counts)
+
         # Print summary
         print(f"\n{'='*60}")
         print(f"FINAL RESULTS")
@@ -256,18 +556,23 @@ async def run_batch_pipeline(
     limit: int = None,
     batch_size: int = 10,
     max_concurrent: int = 5,
+    max_rps: float = 5.0,
     skip_existing: bool = True,
-    skip_failed: bool = True
+    skip_failed: bool = True,
+    known_urls: set = None
 ):
     """
     Main entry point for batch processing jobs from GitHub.
-    
+
     Args:
         limit: Max number of jobs to process (None = all)
         batch_size: Jobs per batch
         max_concurrent: Max concurrent scraping tasks
+        max_rps: Max scrape requests per second
         skip_existing: If True, skip jobs already in the database
         skip_failed: If True, skip URLs that previously failed to scrape
+        known_urls: Optional in-memory URL set maintained by a daemon;
+            jobs in it are dropped without touching the database
     """
     # Initialize database
     init_db()
@@ -281,10 +586,16 @@ async def run_batch_pipeline(
         return []
     
     print(f"✓ Found {len(jobs)} total job postings")
+
+    # Drop in-feed duplicates before any DB lookups or scraping
+    before = len(jobs)
+    jobs = dedupe_jobs(jobs)
+    if len(jobs) < before:
+        print(f"✓ Removed {before - len(jobs)} duplicate URLs from the feed")
     
     # Filter out already-processed and failed jobs
     if skip_existing:
-        jobs = filter_new_jobs(jobs, skip_failed=skip_failed)
+        jobs = filter_new_jobs(jobs, skip_failed=skip_failed, known_urls=known_urls)
         
         if not jobs:
             print("All jobs have already been processed!")
@@ -296,17 +607,16 @@ async def run_batch_pipeline(
         print(f"📊 Limiting to {limit} new jobs (out of {len(jobs)} available)")
         jobs = jobs[:limit]
     
-    # Process in batches
-    processor = BatchProcessor(
+    # Process in batches (context manager owns the shared HTTP client)
+    async with BatchProcessor(
         max_concurrent=max_concurrent,
-        delay_between_batches=2.0
-    )
-    
-    results = await processor.process_all(jobs, batch_size=batch_size)
-    
+        max_rps=max_rps
+    ) as processor:
+        results = await processor.process_all(jobs, batch_size=batch_size)
+
     # Print final stats
     print_stats()
-    
+
     return results
 
 
@@ -8,10 +8,13 @@ import pandas as pd
 import altair as alt
 import sys
 from datetime import datetime
+from pathlib import Path
+
+from psycopg.rows import scalar_row
 
 # Add src to path for imports
 sys.path.insert(0, '.')
-from db import get_db_connection, init_db, get_job_categories, categorize_all_jobs, get_top_skills_by_job_category, get_top_skills_filtered
+from db import init_db
 
 # Page config
 st.set_page_config(
@@ -21,179 +24,107 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS to hide Streamlit branding and UI elements
-hide_st_style = """
-    <style>
-    /* Hide the 3-dot menu */
-    #MainMenu {visibility: hidden; display: none !important;}
-    /* Hide the "Made with Streamlit" footer */
-    footer {visibility: hidden; display: none !important;}
-    /* Hide the top header bar */
-    header {visibility: hidden; display: none !important;}
-    /* Hide the deploy button */
-    .stDeployButton {display: none !important;}
-    /* Hide the decoration (top colored bar) */
-    [data-testid="stDecoration"] {display: none !important;}
-    /* Hide the toolbar */
-    [data-testid="stToolbar"] {display: none !important;}
-    /* Attempt to hide viewer badge if accessible */
-    .viewerBadge_container__1QSob {display: none !important;}
-    </style>
-"""
-st.markdown(hide_st_style, unsafe_allow_html=True)
+# Custom CSS (hides Streamlit chrome, fonts, layout) lives in a static
+# file; read once per server process instead of re-parsing a ~4KB string
+# constant on every rerun
+@st.cache_data
+def load_css() -> str:
+    css_path = Path(__file__).resolve().parent.parent / "static" / "dashboard.css"
+    return css_path.read_text()
+
 
-# Custom CSS for Times New Roman font, hide sidebar, and narrow content
-st.markdown("""
-<style>
-    /* Apply Times New Roman to main content only - be specific to avoid table menus */
-    .main h1, .main h2, .main h3, .main p, 
-    .main [data-testid="stMarkdown"],
-    .main [data-testid="stMetricLabel"],
-    .main [data-testid="stMetricValue"],
-    .main [data-testid="stCaption"],
-    .main label,
-    .main .stSelectbox label,
-    .main .stButton button {
-        font-family: "Times New Roman", Times, serif !important;
-    }
-    [data-testid="stSidebar"] {
-        display: none;
-    }
-    .main .block-container {
-        max-width: 800px;
-        padding-left: 2rem;
-        padding-right: 2rem;
-    }
-    /* Bold title */
-    h1 {
-        font-weight: bold !important;
-    }
-    /* Tighter spacing between metrics only */
-    [data-testid="stVerticalBlock"] > [data-testid="stVerticalBlock"] {
-        gap: 0.5rem !important;
-    }
-    /* Code blocks - larger font and all white text */
-    pre, code, [data-testid="stCodeBlock"], [data-testid="stCodeBlock"] pre {
-        font-size: 1.1rem !important;
-    }
-    /* Override syntax highlighting to make everything white */
-    pre code, pre code span, code span, .highlight, .hljs,
-    [data-testid="stCodeBlock"] code, [data-testid="stCodeBlock"] code span,
-    [data-testid="stCodeBlock"] pre code, [data-testid="stCodeBlock"] pre code span {
-        color: white !important;
-    }
-    /* Override specific syntax highlighting colors */
-    .hljs-keyword, .hljs-string, .hljs-number, .hljs-comment,
-    .hljs-function, .hljs-variable, .hljs-operator, .hljs-built_in {
-        color: white !important;
-    }
-    /* Pointer cursor for selectbox dropdown */
-    [data-baseweb="select"],
-    [data-baseweb="select"] *,
-    [data-baseweb="select"] input,
-    [data-testid="stSelectbox"],
-    [data-testid="stSelectbox"] *,
-    div[data-baseweb="select"] > div,
-    div[data-baseweb="select"] > div > div {
-        cursor: pointer !important;
-    }
-    /* Force metric labels to wrap into 2 lines */
-    [data-testid="stMetricLabel"] {
-        white-space: normal !important;
-        word-wrap: break-word !important;
-        text-overflow: clip !important;
-        overflow: visible !important;
-        font-size: 1.2rem !important;
-    }
-    [data-testid="stMetricLabel"] > div {
-        text-overflow: clip !important;
-        overflow: visible !important;
-        white-space: normal !important;
-        font-size: 1.2rem !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 
 # ============================================================
 # DATABASE QUERY FUNCTIONS
 # ============================================================
 
-@st.cache_data(ttl=60)  # Cache for 60 seconds
-def get_overview_stats():
-    """Get high-level statistics."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) as count FROM jobs")
-            total_jobs = cur.fetchone()['count']
-            
-            # Count total occurrences of skills/concepts (from junction table)
-            cur.execute("SELECT COUNT(*) as count FROM job_skills")
-            total_skills_concepts = cur.fetchone()['count']
-            
-            cur.execute("""
-                SELECT COUNT(*) as count FROM jobs 
-                WHERE created_at >= CURRENT_DATE
-            """)
-            jobs_today = cur.fetchone()['count']
-            
-            cur.execute("SELECT COUNT(DISTINCT company) as count FROM jobs WHERE company IS NOT NULL")
-            total_companies = cur.fetchone()['count']
-            
-            return {
-                'total_jobs': total_jobs,
-                'total_skills_concepts': total_skills_concepts,
-                'jobs_today': jobs_today,
-                'total_companies': total_companies
-            }
+@st.cache_resource
+def get_connection_pool():
+    """
+    One psycopg connection pool per Streamlit server process, so cache
+    misses reuse warm connections instead of paying a TCP+auth handshake.
+    """
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+    from db import DB_URL
+    return ConnectionPool(DB_URL, min_size=1, max_size=8,
+                          kwargs={'row_factory': dict_row})
 
 
-@st.cache_data(ttl=60)
-def get_top_skills(limit=15, category=None):
-    """Get most in-demand skills, optionally filtered by category."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            if category:
-                cur.execute("""
-                    SELECT s.name, s.category, COUNT(js.job_id) as job_count
+# Cache aligned with scrape cadence - data only changes when the pipeline runs
+@st.cache_data(ttl=600)
+def get_dashboard_bundle(skill_category=None, job_category=None):
+    """
+    Fetch everything the overview page needs in ONE round-trip:
+    overview counters, skill/job category lists (for the filter dropdowns)
+    and the top-50 skills under the given filters. Chart and table are
+    just different slices of the same top-skills list.
+    """
+    with get_connection_pool().connection() as conn:
+        # Single-value result - scalar_row skips the dict-row wrapper
+        with conn.cursor(row_factory=scalar_row) as cur:
+            cur.execute("""
+                WITH overview AS (
+                    SELECT
+                        (SELECT COUNT(*) FROM jobs) AS total_jobs,
+                        (SELECT COUNT(*) FROM job_skills) AS total_skills_concepts,
+                        (SELECT COUNT(*) FROM jobs
+                         WHERE created_at >= CURRENT_DATE) AS jobs_today,
+                        (SELECT COUNT(DISTINCT company) FROM jobs
+                         WHERE company IS NOT NULL) AS total_companies
+                ),
+                skills_cat AS (
+                    SELECT s.category, COUNT(DISTINCT js.job_id) AS job_count
                     FROM skills s
                     JOIN job_skills js ON s.id = js.skill_id
-                    WHERE s.category = %s
-                    GROUP BY s.id, s.name, s.category
+                    GROUP BY s.category
                     ORDER BY job_count DESC
-                    LIMIT %s
-                """, (category, limit))
-            else:
-                cur.execute("""
-                    SELECT s.name, s.category, COUNT(js.job_id) as job_count
-                    FROM skills s
-                    JOIN job_skills js ON s.id = js.skill_id
-                    GROUP BY s.id, s.name, s.category
+                ),
+                job_cats AS (
+                    SELECT category, COUNT(*) AS count
+                    FROM jobs
+                    WHERE category IS NOT NULL
+                    GROUP BY category
+                    ORDER BY count DESC
+                ),
+                top_skills AS (
+                    -- No job-category filter: constant-time read off the
+                    -- precomputed view. Otherwise fall back to the full join.
+                    SELECT * FROM (
+                        SELECT name, category, job_count
+                        FROM skill_counts_mv
+                        WHERE %(job_category)s::text IS NULL
+                          AND (%(skill_category)s::text IS NULL OR category = %(skill_category)s)
+                          AND job_count > 0
+                        UNION ALL
+                        SELECT s.name, s.category, COUNT(js.job_id) AS job_count
+                        FROM skills s
+                        JOIN job_skills js ON s.id = js.skill_id
+                        JOIN jobs j ON js.job_id = j.id
+                        WHERE %(job_category)s::text IS NOT NULL
+                          AND j.category = %(job_category)s
+                          AND (%(skill_category)s::text IS NULL OR s.category = %(skill_category)s)
+                        GROUP BY s.id, s.name, s.category
+                    ) unioned
                     ORDER BY job_count DESC
-                    LIMIT %s
-                """, (limit,))
-            return cur.fetchall()
+                    LIMIT 50
+                )
+                SELECT json_build_object(
+                    'overview', (SELECT row_to_json(overview) FROM overview),
+                    'skills_by_category', (SELECT json_agg(skills_cat) FROM skills_cat),
+                    'job_categories', (SELECT json_agg(job_cats) FROM job_cats),
+                    'top_skills', (SELECT json_agg(top_skills) FROM top_skills)
+                ) AS bundle
+            """, {'skill_category': skill_category, 'job_category': job_category})
+            return cur.fetchone()
 
 
-@st.cache_data(ttl=60)
-def get_skills_by_category():
-    """Get skill counts grouped by category."""
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT s.category, COUNT(DISTINCT js.job_id) as job_count
-                FROM skills s
-                JOIN job_skills js ON s.id = js.skill_id
-                GROUP BY s.category
-                ORDER BY job_count DESC
-            """)
-            return cur.fetchall()
-
-
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=600)
 def get_top_companies(limit=10):
     """Get companies with most job postings."""
-    with get_db_connection() as conn:
+    with get_connection_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
                 SELECT company, COUNT(*) as job_count
@@ -206,22 +137,26 @@ def get_top_companies(limit=10):
             return cur.fetchall()
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=600)
 def get_recent_jobs(limit=20):
     """Get recently scraped jobs."""
-    with get_db_connection() as conn:
+    with get_connection_pool().connection() as conn:
         with conn.cursor() as cur:
+            # One grouped aggregation instead of a correlated subquery per row
             cur.execute("""
                 SELECT j.id, j.title, j.company, j.url, j.created_at,
                        COALESCE(
-                           (SELECT string_agg(s.name, ', ' ORDER BY s.name)
-                            FROM job_skills js
-                            JOIN skills s ON js.skill_id = s.id
-                            WHERE js.job_id = j.id
-                            LIMIT 10),
+                           array_to_string(
+                               (array_agg(s.name ORDER BY s.name)
+                                   FILTER (WHERE s.name IS NOT NULL))[1:10],
+                               ', '
+                           ),
                            'None'
                        ) as skills
                 FROM jobs j
+                LEFT JOIN job_skills js ON js.job_id = j.id
+                LEFT JOIN skills s ON s.id = js.skill_id
+                GROUP BY j.id
                 ORDER BY j.created_at DESC
                 LIMIT %s
             """, (limit,))
@@ -247,8 +182,9 @@ def show_overview():
     st.markdown('<h1><strong>SkillScrape</strong></h1>', unsafe_allow_html=True)
     st.markdown('<p style="font-size: 1.25rem; color: #888; margin-top: -0.5rem; margin-bottom: 1.5rem;">Frequently appearing skills found in tech internship postings</p>', unsafe_allow_html=True)
     
-    # Stats cards
-    stats = get_overview_stats()
+    # One query feeds the stats cards, filter options and skill lists
+    bundle = get_dashboard_bundle()
+    stats = bundle['overview']
     
     # Two metrics side by side (not spread across full width)
     metric_col1, metric_col2, spacer = st.columns([1, 1, 2])
@@ -274,8 +210,8 @@ def show_overview():
     st.header("Skills Overview")
     
     # Get available skill type categories for filter
-    categories_data = get_skills_by_category()
-    available_categories = [cat['category'] for cat in categories_data] if categories_data else []
+    categories_data = bundle['skills_by_category'] or []
+    available_categories = [cat['category'] for cat in categories_data]
     
     # Create capitalized display options for skill types
     display_options = ["All"] + [cat.capitalize() for cat in available_categories]
@@ -283,7 +219,7 @@ def show_overview():
     category_map = {display: orig for display, orig in zip(display_options, ["All"] + available_categories)}
     
     # Get job categories for filter (put "Other" at the bottom)
-    job_categories_data = get_job_categories()
+    job_categories_data = bundle['job_categories'] or []
     if job_categories_data:
         categories = [cat['category'] for cat in job_categories_data]
         # Move "Other" to the end
@@ -313,18 +249,23 @@ def show_overview():
             key="job_category_filter"
         )
     
-    # Get skills based on BOTH filters for chart (top 10)
-    top_skills_chart = get_top_skills_filtered(
-        limit=10,
-        skill_category=None if selected_category == "All" else selected_category,
-        job_category=None if selected_job_category == "All Jobs" else selected_job_category
-    )
+    # Re-fetch the bundle only when a filter is active (the cached
+    # unfiltered bundle already has the top 50)
+    skill_filter = None if selected_category == "All" else selected_category
+    job_filter = None if selected_job_category == "All Jobs" else selected_job_category
+    if skill_filter or job_filter:
+        bundle = get_dashboard_bundle(skill_category=skill_filter, job_category=job_filter)
+
+    top_skills = bundle['top_skills'] or []
+    df_skills = pd.DataFrame(top_skills)
+
+    # Chart and table are slices of the same result set
+    top_skills_chart = df_skills.head(10)
     
     # Display chart
-    if top_skills_chart:
-        df_chart = pd.DataFrame(top_skills_chart)
+    if not top_skills_chart.empty:
         # Ensure descending order (highest to lowest, left to right)
-        df_chart = df_chart.sort_values('job_count', ascending=False, ignore_index=True)
+        df_chart = top_skills_chart.sort_values('job_count', ascending=False, ignore_index=True)
         # Use Altair for custom sort order (descending by job_count)
         chart = alt.Chart(df_chart).mark_bar(color='#8ab4f8').encode(
             x=alt.X('name:N', sort='-y', title=None, axis=alt.Axis(labelAngle=-45, labelOverlap=False, labelLimit=200, labelFontSize=15)),
@@ -341,15 +282,9 @@ def show_overview():
     
     st.markdown("---")
     
-    # Skills list (top 25, same filters)
-    top_skills_table = get_top_skills_filtered(
-        limit=25,
-        skill_category=None if selected_category == "All" else selected_category,
-        job_category=None if selected_job_category == "All Jobs" else selected_job_category
-    )
-    
-    if top_skills_table:
-        df_table = pd.DataFrame(top_skills_table)
+    # Skills list (top 25, same filters, same result set)
+    if not df_skills.empty:
+        df_table = df_skills.head(25).copy()
         df_table.columns = ['Skill', 'Category', 'Job Count']
         df_table.index = range(1, len(df_table) + 1)
         # Configure column widths - smaller for index and Job Count
@@ -1,8 +1,19 @@
+import atexit
+import logging
 import os
+import re
+import time
+from functools import lru_cache
+
 import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 from dotenv import load_dotenv
 
+# Per-row detail goes through this logger at DEBUG so the save hot path
+# doesn't write (and flush) stdout once per job; summaries stay as prints
+logger = logging.getLogger(__name__)
+
 # Load environment variables (for local development)
 load_dotenv()
 
@@ -103,59 +114,79 @@ JOB_CATEGORIES = [
                               'kubernetes', 'aws', 'azure', 'gcp', 'network']),
 ]
 
+# Compiled once at import: each category's keyword list becomes a single
+# alternation so a title is matched in one scan per category instead of
+# one substring search per keyword
+_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(re.escape(k) for k in keywords)))
+    for category, keywords in JOB_CATEGORIES
+]
+
+@lru_cache(maxsize=4096)
 def categorize_job_title(title: str) -> str:
     """
     Categorize a job title based on keywords.
     Returns the category name or 'Other' if no match.
+    Results are memoized - the same titles recur constantly across runs.
     """
     if not title:
         return 'Other'
-    
+
     title_lower = title.lower()
-    
-    for category, keywords in JOB_CATEGORIES:
-        for keyword in keywords:
-            if keyword in title_lower:
-                return category
-    
+
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(title_lower):
+            return category
+
     return 'Other'
 
+# Vague/non-technical skill fragments to drop entirely
+SKILL_SKIP_TERMS = ['problem solving', 'communication', 'teamwork', 'fast-paced',
+                    'self-starter', 'detail-oriented', 'passionate', 'motivated',
+                    'excellent', 'strong', 'good', 'ability to', 'experience with']
+
+# Compound technical terms that must not be split on '/'
+SKILL_KEEP_AS_SINGLE = ['data structures', 'algorithms', 'data structures & algorithms',
+                        'data structures and algorithms', 'object oriented',
+                        'machine learning', 'deep learning', 'computer vision',
+                        'natural language processing', 'distributed systems']
+
+# Compiled alternations so each skill is checked in one scan per list
+_SKILL_SKIP_PATTERN = re.compile('|'.join(re.escape(t) for t in SKILL_SKIP_TERMS))
+_SKILL_KEEP_PATTERN = re.compile('|'.join(re.escape(t) for t in SKILL_KEEP_AS_SINGLE))
+
+
 def normalize_skill(skill_name: str) -> list:
     """
     Normalizes a skill name and splits combined skills.
     Returns a list of normalized skill names.
     """
     skill = skill_name.strip()
-    
+
     # Skip empty skills
     if not skill:
         return []
-    
+
+    skill_lower = skill.lower()
+
     # Check for known aliases FIRST (handles single-char like C, R)
-    if skill.lower() in SKILL_ALIASES:
-        return [SKILL_ALIASES[skill.lower()]]
-    
+    if skill_lower in SKILL_ALIASES:
+        return [SKILL_ALIASES[skill_lower]]
+
     # Skip very short skills that aren't in aliases
     if len(skill) < 2:
         return []
-    
+
     # Note: alias check already done above, this is for the split case
-    
+
     # Skip vague/non-technical skills
-    skip_terms = ['problem solving', 'communication', 'teamwork', 'fast-paced', 
-                  'self-starter', 'detail-oriented', 'passionate', 'motivated',
-                  'excellent', 'strong', 'good', 'ability to', 'experience with']
-    if any(term in skill.lower() for term in skip_terms):
+    if _SKILL_SKIP_PATTERN.search(skill_lower):
         return []
-    
+
     # Keep compound technical terms as single skills
-    keep_as_single = ['data structures', 'algorithms', 'data structures & algorithms',
-                      'data structures and algorithms', 'object oriented', 
-                      'machine learning', 'deep learning', 'computer vision',
-                      'natural language processing', 'distributed systems']
-    if any(term in skill.lower() for term in keep_as_single):
+    if _SKILL_KEEP_PATTERN.search(skill_lower):
         return [skill]
-    
+
     # Split combined skills like "C/C++", "React/Vue", "Python/Java"
     if '/' in skill and len(skill) < 20:  # Only split short combined skills
         parts = [p.strip() for p in skill.split('/')]
@@ -165,15 +196,34 @@ def normalize_skill(skill_name: str) -> list:
                 normalized = SKILL_ALIASES.get(part.lower(), part)
                 result.append(normalized)
         return result if result else [skill]
-    
+
     # Return as-is if no special handling needed
     return [skill]
 
+# Shared connection pool, created lazily so importing db.py never opens
+# a connection (e.g. the dashboard manages its own pool)
+_pool = None
+
+def _get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
+            DB_URL,
+            min_size=1,
+            max_size=10,
+            kwargs={'row_factory': dict_row},
+        )
+        atexit.register(_pool.close)
+    return _pool
+
 def get_db_connection():
-    """Establishes a connection to the PostgreSQL database."""
+    """
+    Check out a connection from the shared pool.
+    Use as a context manager; the connection is committed and returned
+    to the pool on exit instead of being closed.
+    """
     try:
-        conn = psycopg.connect(DB_URL, row_factory=dict_row)
-        return conn
+        return _get_pool().connection()
     except Exception as e:
         print(f"DB Connection Failed {e}")
         raise e
@@ -225,99 +275,344 @@ def init_db():
                 );
                 """)
                 
-                # Index for performance
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_jobs_skills_gin ON jobs USING GIN (raw_skills_data);")
+                # 5. PARSE_CACHE (Gemini results keyed by page-content hash,
+                #    so reposted/duplicate ads skip the LLM call)
+                cur.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    html_hash TEXT PRIMARY KEY,
+                    parsed_json JSONB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                """)
+
+                # Index for performance. jsonb_path_ops only supports the
+                # containment operators we actually query with (@>), and is
+                # considerably smaller and faster to update than the default
+                # GIN opclass. Drop the old default-opclass index if present.
+                cur.execute("DROP INDEX IF EXISTS idx_jobs_skills_gin;")
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_skills_gin_path
+                    ON jobs USING GIN (raw_skills_data jsonb_path_ops);
+                """)
                 
                 # Add category column if it doesn't exist (for existing databases)
                 cur.execute("""
                     ALTER TABLE jobs ADD COLUMN IF NOT EXISTS category TEXT;
                 """)
-                
+
+                # Query-string-stripped URL, maintained by Postgres, so
+                # dedup checks don't have to test both URL forms client-side.
+                # Not unique: legacy rows may hold several tracking-param
+                # variants of the same base URL.
+                cur.execute("""
+                    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS url_base TEXT
+                    GENERATED ALWAYS AS (split_part(url, '?', 1)) STORED;
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_url_base
+                    ON jobs (url_base);
+                """)
+
+                # B-tree indexes for the dashboard aggregations: the skill
+                # counts join job_skills by skill_id (the PK only covers
+                # job_id-first lookups), and both category columns drive
+                # GROUP BY / filter queries
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_job_skills_skill_id
+                    ON job_skills (skill_id);
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_jobs_category
+                    ON jobs (category) WHERE category IS NOT NULL;
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_skills_category
+                    ON skills (category);
+                """)
+
+                # Precomputed per-skill job counts. Only the pipeline writes,
+                # so the dashboard can read this instead of re-aggregating
+                # job_skills on every render; refreshed after each run.
+                cur.execute("""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS skill_counts_mv AS
+                    SELECT s.id, s.name, s.category, COUNT(js.job_id) AS job_count
+                    FROM skills s
+                    LEFT JOIN job_skills js ON s.id = js.skill_id
+                    GROUP BY s.id, s.name, s.category;
+                """)
+                # Unique index required for REFRESH ... CONCURRENTLY
+                cur.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_skill_counts_mv_id
+                    ON skill_counts_mv (id);
+                """)
+
                 conn.commit()
         print("PostgreSQL Database initialized successfully.")
     except Exception as e:
         print(f"Init failed: {e}")
 
-def save_job_data(job_data):
+def _save_job_with_cursor(cur, job_data) -> bool:
     """
-    Saves a parsed job to Postgres.
-    Skips non-tech jobs based on title analysis.
+    Write one parsed job (and its skills) using an existing cursor.
+    Does NOT commit - the caller owns the transaction.
+
+    Returns:
+        True if the job was written, False if it was skipped as non-tech.
     """
     job_title = job_data.get('job_title')
-    
+
     # Skip non-tech jobs
     if not is_tech_related_job(job_title):
-        print(f"⏭️  Skipping non-tech job: '{job_title}'")
-        return
-    
+        logger.debug("Skipping non-tech job: %s", job_title)
+        return False
+
+    # Categorize the job before saving
+    category = categorize_job_title(job_title)
+
+    # 1. Insert Job (Using ON CONFLICT to ignore duplicates).
+    # prepare=True: connections are pooled, so the server parses and
+    # plans this statement once per connection instead of once per job.
+    cur.execute("""
+    INSERT INTO jobs (title, company, url, raw_skills_data, category)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (url) DO UPDATE
+        SET raw_skills_data = EXCLUDED.raw_skills_data,
+            category = EXCLUDED.category
+    RETURNING id;
+    """, (
+        job_title,
+        job_data.get('company'),
+        job_data.get('url'),
+        psycopg.types.json.Json(job_data),  # Store full JSONB
+        category
+    ), prepare=True)
+
+    # DO UPDATE means RETURNING always yields the row, insert or conflict
+    job_id = cur.fetchone()['id']
+
+    # 2. Process Relational Skills (For Clustering)
+    all_skills = job_data.get('skills', {})
+
+    # Collect every normalized (name, category) pair first, then write the
+    # whole set in three statements instead of three round-trips per skill
+    skills_to_insert = []
+    seen_names = set()
+    for category, skill_list in all_skills.items():
+        for skill_name in skill_list:
+            # Normalize and split combined skills
+            for clean_name in normalize_skill(skill_name):
+                if clean_name not in seen_names:
+                    seen_names.add(clean_name)
+                    skills_to_insert.append((clean_name, category))
+
+    if skills_to_insert:
+        # Upsert skills in one batch. The no-op DO UPDATE (category keeps
+        # its stored value) makes RETURNING yield an id for conflicting
+        # rows too, so no follow-up SELECT is needed.
+        cur.executemany("""
+        INSERT INTO skills (name, category)
+        VALUES (%s, %s)
+        ON CONFLICT (name) DO UPDATE SET category = skills.category
+        RETURNING id;
+        """, skills_to_insert, returning=True)
+
+        skill_ids = []
+        while True:
+            skill_ids.append(cur.fetchone()['id'])
+            if not cur.nextset():
+                break
+
+        # Link Job <-> Skill in one batch
+        cur.executemany("""
+        INSERT INTO job_skills (job_id, skill_id)
+        VALUES (%s, %s)
+        ON CONFLICT DO NOTHING;
+        """, [(job_id, skill_id) for skill_id in skill_ids])
+
+    return True
+
+
+# In-process cache of "which URLs are already processed/failed" sets.
+# Pipeline runs consult these sets repeatedly (filtering, retries) and
+# they only change when this process writes, so a short TTL plus
+# explicit invalidation on every write keeps them trustworthy.
+_URL_CACHE_TTL_SECONDS = 300
+_url_set_cache = {}  # key -> (monotonic timestamp, set)
+
+
+def get_cached_url_set(key: str, loader):
+    """
+    Return the cached URL set for `key`, loading it with `loader()` when
+    missing or older than the TTL.
+    """
+    entry = _url_set_cache.get(key)
+    if entry and time.monotonic() - entry[0] < _URL_CACHE_TTL_SECONDS:
+        return entry[1]
+    value = loader()
+    _url_set_cache[key] = (time.monotonic(), value)
+    return value
+
+
+def invalidate_url_cache():
+    """Drop the cached URL sets after a write that changes them."""
+    _url_set_cache.clear()
+
+
+def save_job_data(job_data):
+    """
+    Saves a parsed job to Postgres.
+    Skips non-tech jobs based on title analysis.
+    """
     with get_db_connection() as conn:
         with conn.cursor() as cur:
             try:
-                # Categorize the job before saving
-                category = categorize_job_title(job_title)
-                
-                # 1. Insert Job (Using ON CONFLICT to ignore duplicates)
-                cur.execute("""
-                INSERT INTO jobs (title, company, url, raw_skills_data, category) 
+                # Pipeline mode queues the job/skills/link statements
+                # without waiting for each response; only the job-id fetch
+                # forces a sync, so a save costs ~2 round-trips instead of
+                # one per statement
+                with conn.pipeline():
+                    saved = _save_job_with_cursor(cur, job_data)
+                if saved:
+                    conn.commit()
+                    invalidate_url_cache()
+                    logger.debug("Saved job %s to Postgres", job_data.get('job_title'))
+            except Exception as e:
+                conn.rollback()
+                print(f"Database Error: {e}")
+
+
+def save_jobs_bulk(job_data_list) -> int:
+    """
+    Saves many parsed jobs in a single transaction using a COPY-fed
+    staging table: one batched upsert for the jobs, one COPY stream for
+    every (url, skill, category) row, then two set-based statements to
+    populate skills and job_skills - no per-skill SQL at all.
+
+    Returns:
+        Number of jobs written.
+    """
+    if not job_data_list:
+        return 0
+
+    # Classify and normalize client-side first
+    job_rows = []
+    skill_rows = []
+    for job_data in job_data_list:
+        job_title = job_data.get('job_title')
+        if not is_tech_related_job(job_title):
+            logger.debug("Skipping non-tech job: %s", job_title)
+            continue
+
+        url = job_data.get('url')
+        job_rows.append((
+            job_title,
+            job_data.get('company'),
+            url,
+            psycopg.types.json.Json(job_data),
+            categorize_job_title(job_title),
+        ))
+
+        seen_names = set()
+        for category, skill_list in job_data.get('skills', {}).items():
+            for skill_name in skill_list:
+                for clean_name in normalize_skill(skill_name):
+                    if clean_name not in seen_names:
+                        seen_names.add(clean_name)
+                        skill_rows.append((url, clean_name, category))
+
+    if not job_rows:
+        return 0
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.executemany("""
+                INSERT INTO jobs (title, company, url, raw_skills_data, category)
                 VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (url) DO UPDATE 
+                ON CONFLICT (url) DO UPDATE
                     SET raw_skills_data = EXCLUDED.raw_skills_data,
-                        category = EXCLUDED.category
-                RETURNING id;
-                """, (
-                    job_title, 
-                    job_data.get('company'), 
-                    job_data.get('url'),
-                    psycopg.types.json.Json(job_data),  # Store full JSONB
-                    category
-                ))
-                
-                # Handle case where job already existed and we just updated it
-                result = cur.fetchone()
-                if not result:
-                    # If no row returned, we need to fetch the ID manually
-                    cur.execute("SELECT id FROM jobs WHERE url = %s", (job_data['url'],))
-                    job_id = cur.fetchone()['id']
-                else:
-                    job_id = result['id']
-
-                # 2. Process Relational Skills (For Clustering)
-                all_skills = job_data.get('skills', {})
-                
-                for category, skill_list in all_skills.items():
-                    for skill_name in skill_list:
-                        # Normalize and split combined skills
-                        normalized_skills = normalize_skill(skill_name)
-                        
-                        for clean_name in normalized_skills:
-                            # Insert Skill if new
-                            cur.execute("""
-                            INSERT INTO skills (name, category) 
-                            VALUES (%s, %s)
-                            ON CONFLICT (name) DO NOTHING
-                            RETURNING id;
-                            """, (clean_name, category))
-                            
-                            skill_res = cur.fetchone()
-                            if skill_res:
-                                skill_id = skill_res['id']
-                            else:
-                                cur.execute("SELECT id FROM skills WHERE name = %s", (clean_name,))
-                                skill_id = cur.fetchone()['id']
-                            
-                            # Link Job <-> Skill
-                            cur.execute("""
-                            INSERT INTO job_skills (job_id, skill_id)
-                            VALUES (%s, %s)
-                            ON CONFLICT DO NOTHING;
-                            """, (job_id, skill_id))
-                
+                        category = EXCLUDED.category;
+                """, job_rows)
+
+                # Stream all skill rows through COPY into a staging table
+                cur.execute("""
+                CREATE TEMP TABLE tmp_skills (
+                    job_url TEXT,
+                    name TEXT,
+                    category TEXT
+                ) ON COMMIT DROP;
+                """)
+                with cur.copy("COPY tmp_skills (job_url, name, category) FROM STDIN") as copy:
+                    for row in skill_rows:
+                        copy.write_row(row)
+
+                cur.execute("""
+                INSERT INTO skills (name, category)
+                SELECT DISTINCT name, category FROM tmp_skills
+                ON CONFLICT (name) DO NOTHING;
+                """)
+                cur.execute("""
+                INSERT INTO job_skills (job_id, skill_id)
+                SELECT j.id, s.id
+                FROM tmp_skills t
+                JOIN jobs j ON j.url = t.job_url
+                JOIN skills s ON s.name = t.name
+                ON CONFLICT DO NOTHING;
+                """)
+
                 conn.commit()
-                print(f"💾 Saved job '{job_data.get('job_title')}' to Postgres.")
-                
+                invalidate_url_cache()
+                print(f"💾 Saved batch of {len(job_rows)} jobs to Postgres.")
             except Exception as e:
                 conn.rollback()
-                print(f"Database Error: {e}")
+                print(f"Database Error (batch of {len(job_data_list)}): {e}")
+                return 0
+    return len(job_rows)
+
+def get_parsed_by_hash(html_hash: str):
+    """
+    Look up a cached Gemini parse result by page-content hash.
+
+    Returns:
+        The parsed dict, or None on a cache miss.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT parsed_json FROM parse_cache WHERE html_hash = %s",
+                (html_hash,),
+                prepare=True
+            )
+            row = cur.fetchone()
+            return row['parsed_json'] if row else None
+
+
+def save_parse_cache(html_hash: str, parsed: dict):
+    """Store a Gemini parse result under its page-content hash."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO parse_cache (html_hash, parsed_json)
+                VALUES (%s, %s)
+                ON CONFLICT (html_hash) DO NOTHING
+            """, (html_hash, psycopg.types.json.Json(parsed)), prepare=True)
+            conn.commit()
+
+
+def refresh_skill_counts():
+    """
+    Refresh the precomputed skill counts after a pipeline run.
+    CONCURRENTLY keeps the dashboard readable during the refresh.
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY skill_counts_mv")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Skill counts refresh failed: {e}")
+
 
 def save_failed_url(url: str, error: str):
     """
@@ -333,22 +628,26 @@ def save_failed_url(url: str, error: str):
                     SET attempts = failed_urls.attempts + 1,
                         error = EXCLUDED.error,
                         last_attempt = CURRENT_TIMESTAMP
-            """, (url, error))
+            """, (url, error), prepare=True)
             conn.commit()
+            invalidate_url_cache()
 
 
 def get_failed_urls() -> set:
     """
     Get all URLs that have failed to scrape.
-    
+    Served from the in-process cache between writes.
+
     Returns:
         Set of URLs that failed
     """
-    with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("SELECT url FROM failed_urls")
-            rows = cur.fetchall()
-            return {row['url'] for row in rows}
+    def _load():
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT url FROM failed_urls")
+                return {row['url'] for row in cur.fetchall()}
+
+    return get_cached_url_set('failed', _load)
 
 
 def clear_failed_urls():
@@ -357,6 +656,7 @@ def clear_failed_urls():
         with conn.cursor() as cur:
             cur.execute("DELETE FROM failed_urls")
             conn.commit()
+            invalidate_url_cache()
             print("Cleared all failed URLs")
 
 
@@ -365,21 +665,25 @@ def categorize_all_jobs():
     Categorize all existing jobs based on their titles.
     This updates the category column for all jobs without re-scraping.
     """
+    # Mirror categorize_job_title() server-side: one UPDATE with a CASE
+    # whose branches are the keyword lists as regex alternations, in the
+    # same priority order, instead of a round-trip per row
+    case_branches = []
+    params = []
+    for category, keywords in JOB_CATEGORIES:
+        case_branches.append("WHEN title ~* %s THEN %s")
+        params.append('|'.join(re.escape(k) for k in keywords))
+        params.append(category)
+
+    query = f"""
+        UPDATE jobs
+        SET category = CASE {' '.join(case_branches)} ELSE 'Other' END
+    """
+
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            # Get all jobs
-            cur.execute("SELECT id, title FROM jobs")
-            jobs = cur.fetchall()
-            
-            updated = 0
-            for job in jobs:
-                category = categorize_job_title(job['title'])
-                cur.execute(
-                    "UPDATE jobs SET category = %s WHERE id = %s",
-                    (category, job['id'])
-                )
-                updated += 1
-            
+            cur.execute(query, params)
+            updated = cur.rowcount
             conn.commit()
             print(f"✅ Categorized {updated} jobs")
             return updated
@@ -466,23 +770,22 @@ NON_TECH_JOB_PATTERNS = [
     'public affairs', 'policy', 'security investigator'
 ]
 
+# Single alternation over every non-tech pattern, compiled at import
+_NON_TECH_PATTERN = re.compile('|'.join(re.escape(p) for p in NON_TECH_JOB_PATTERNS))
+
 
+@lru_cache(maxsize=4096)
 def is_tech_related_job(title: str) -> bool:
     """
     Check if a job title is tech-related.
     Returns True for tech jobs, False for non-tech jobs that should be excluded.
+    Memoized alongside categorize_job_title for repeated titles.
     """
     if not title:
         return False
-    
-    title_lower = title.lower()
-    
+
     # Check if title matches non-tech patterns
-    for pattern in NON_TECH_JOB_PATTERNS:
-        if pattern in title_lower:
-            return False
-    
-    return True
+    return _NON_TECH_PATTERN.search(title.lower()) is None
 
 
 def delete_non_tech_jobs():
@@ -490,31 +793,28 @@ def delete_non_tech_jobs():
     Delete jobs that are not related to software/tech from the database.
     Returns the count of deleted jobs.
     """
+    # Same alternation is_tech_related_job matches against, evaluated
+    # server-side: one DELETE over one table scan instead of a SELECT of
+    # every row plus a DELETE per match
+    pattern = '|'.join(re.escape(p) for p in NON_TECH_JOB_PATTERNS)
+
     with get_db_connection() as conn:
         with conn.cursor() as cur:
-            # First, get all jobs to check
-            cur.execute("SELECT id, title FROM jobs")
-            jobs = cur.fetchall()
-            
-            deleted_count = 0
-            deleted_jobs = []
-            
-            for job in jobs:
-                if not is_tech_related_job(job['title']):
-                    deleted_jobs.append(f"  - {job['title']}")
-                    cur.execute("DELETE FROM jobs WHERE id = %s", (job['id'],))
-                    deleted_count += 1
-            
+            cur.execute(
+                "DELETE FROM jobs WHERE lower(title) ~ %s RETURNING title",
+                (pattern,)
+            )
+            deleted_jobs = cur.fetchall()
             conn.commit()
-            
+
             if deleted_jobs:
-                print(f"🗑️  Deleted {deleted_count} non-tech jobs:")
+                print(f"🗑️  Deleted {len(deleted_jobs)} non-tech jobs:")
                 for job in deleted_jobs:
-                    print(job)
+                    print(f"  - {job['title']}")
             else:
                 print("✅ No non-tech jobs found to delete.")
-            
-            return deleted_count
+
+            return len(deleted_jobs)
 
 
 def fix_skill_categories():
@@ -4,34 +4,128 @@ GitHub README Job Scraper
 Extracts job posting URLs from the SimplifyJobs Summer2026-Internships repo.
 Uses the raw GitHub URL to fetch the README directly (no JavaScript needed!).
 """
+import json
 import re
 import requests
 from typing import List, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
 
 # Raw GitHub URL for the README (bypasses the web interface)
 GITHUB_RAW_URL = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md"
 
+# Pattern to match the cells of one README table row
+# Captures: company name, role, location, and apply URL
+# Only ever applied to a single row's HTML (see extract_job_urls)
+_ROW_PATTERN = re.compile(
+    r'<td>(?:<strong>)?(?:<a[^>]*>)?([^<]+)(?:</a>)?(?:</strong>)?</td>\s*'  # Company or ↳
+    r'<td>([^<]+)</td>\s*'  # Role
+    r'<td>([^<]+)</td>\s*'  # Location
+    r'<td>.*?<a\s+href="([^"]+)".*?</td>',  # Apply URL
+    re.DOTALL
+)
 
-@dataclass
+# Badge emoji stripped from role names, compiled once. The 🇺🇸 flag is two
+# codepoints (regional indicators), so it gets a plain replace instead of
+# living in the character class.
+_EMOJI_PATTERN = re.compile('[\U0001F393\U0001F525\U0001F6C2\U0001F512]+')
+
+# Apply URLs that are not real job applications
+_SKIP_URL_PATTERN = re.compile(r'simplify\.jobs|github\.com')
+
+
+@dataclass(slots=True)
 class JobPosting:
     """Represents a job posting extracted from the GitHub README."""
     company: str
     role: str
     location: str
     apply_url: str
+    # Query-stripped apply URL, computed once here because dedup and
+    # filtering test it repeatedly (partition avoids split's list alloc)
+    url_clean: str = field(init=False)
+
+    def __post_init__(self):
+        self.url_clean = self.apply_url.partition('?')[0]
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an apply URL for deduplication:
+    lowercased host, no query string (drops utm_* tracking params), no fragment.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}{parts.path}"
+
+
+def dedupe_jobs(jobs: List[JobPosting]) -> List[JobPosting]:
+    """
+    Drop postings whose canonical apply URL was already seen.
+    The README frequently lists the same posting more than once (same job
+    via different tracking links), and each duplicate costs a full
+    scrape + LLM parse downstream.
+    """
+    seen = set()
+    unique = []
+    for job in jobs:
+        key = canonicalize_url(job.apply_url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(job)
+    return unique
+
+
+# On-disk cache so an unchanged README (the common case between hourly
+# runs) costs a ~300-byte 304 response instead of a multi-MB download
+_CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache'
+_CACHE_BODY = _CACHE_DIR / 'README.md'
+_CACHE_META = _CACHE_DIR / 'README.meta.json'
 
 
 def fetch_readme(url: str = GITHUB_RAW_URL) -> str:
     """
     Fetches the raw README content from GitHub.
-    
+
+    Sends the cached ETag/Last-Modified as validators; a 304 response
+    returns the cached copy without re-downloading anything.
+
     Returns:
         The raw markdown content of the README.
     """
     print(f"Fetching README from: {url}")
-    response = requests.get(url, timeout=30)
+
+    headers = {'Accept-Encoding': 'gzip'}
+    if _CACHE_BODY.exists() and _CACHE_META.exists():
+        try:
+            meta = json.loads(_CACHE_META.read_text())
+        except Exception:
+            meta = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = requests.get(url, headers=headers, timeout=30)
+
+    if response.status_code == 304:
+        body = _CACHE_BODY.read_text(encoding='utf-8')
+        print(f"README unchanged (304), using cached copy ({len(body):,} characters)")
+        return body
+
     response.raise_for_status()
+
+    # Cache is best-effort; a read-only filesystem shouldn't break the run
+    try:
+        _CACHE_DIR.mkdir(exist_ok=True)
+        _CACHE_BODY.write_text(response.text, encoding='utf-8')
+        _CACHE_META.write_text(json.dumps({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }))
+    except OSError:
+        pass
+
     print(f"Fetched {len(response.text):,} characters")
     return response.text
 
@@ -54,20 +148,15 @@ def extract_job_urls(readme_content: str) -> List[JobPosting]:
     """
     jobs = []
     current_company = None
-    
-    # Pattern to match each table row
-    # Captures: company name, role, location, and apply URL
-    row_pattern = re.compile(
-        r'<tr>\s*'
-        r'<td>(?:<strong>)?(?:<a[^>]*>)?([^<]+)(?:</a>)?(?:</strong>)?</td>\s*'  # Company or ↳
-        r'<td>([^<]+)</td>\s*'  # Role
-        r'<td>([^<]+)</td>\s*'  # Location
-        r'<td>.*?<a\s+href="([^"]+)".*?</td>',  # Apply URL
-        re.DOTALL
-    )
-    
-    # Also match rows where company cell might contain HTML link
-    for match in row_pattern.finditer(readme_content):
+
+    # The README is several MB; one DOTALL pattern with .*? over the whole
+    # document backtracks badly. Split into individual <tr>...</tr> rows
+    # first, so the regex only ever sees one small row at a time.
+    for row_html in readme_content.split('<tr>')[1:]:
+        row_html = row_html.split('</tr>', 1)[0]
+        match = _ROW_PATTERN.search(row_html)
+        if not match:
+            continue
         company_cell = match.group(1).strip()
         role = match.group(2).strip()
         location = match.group(3).strip()
@@ -81,10 +170,10 @@ def extract_job_urls(readme_content: str) -> List[JobPosting]:
             current_company = company
         
         # Clean up role (remove emoji badges)
-        role = re.sub(r'[🎓🔥🛂🇺🇸🔒]+', '', role).strip()
-        
+        role = _EMOJI_PATTERN.sub('', role.replace('🇺🇸', '')).strip()
+
         # Skip if URL doesn't look like a job application
-        if 'simplify.jobs' in apply_url or 'github.com' in apply_url:
+        if _SKIP_URL_PATTERN.search(apply_url):
             continue
         
         jobs.append(JobPosting(
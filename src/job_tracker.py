@@ -4,61 +4,204 @@ Job Tracker
 Tracks which jobs have already been processed to avoid duplicates.
 Uses the database to store processed job URLs.
 """
+import math
 from typing import List, Set
-from db import get_db_connection, get_failed_urls
+
+import xxhash
+from psycopg.rows import scalar_row
+
+from db import get_db_connection, get_cached_url_set
 from github_scraper import JobPosting
 
 
 def get_processed_urls() -> Set[str]:
     """
     Get all URLs that have already been processed and saved to the database.
-    
+    Served from the in-process cache between writes (saves invalidate it).
+
     Returns:
         Set of URLs that are already in the database
     """
+    def _load():
+        # scalar_row skips per-row dict allocation - at 100k+ URLs the
+        # dict rows cost more than the query - and the frozenset result
+        # is safe to hand out from the shared cache
+        with get_db_connection() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
+                cur.execute("SELECT url FROM jobs WHERE url IS NOT NULL")
+                return frozenset(cur)
+
+    return get_cached_url_set('processed', _load)
+
+
+def get_skip_set() -> Set[str]:
+    """
+    Every URL the pipeline should skip - processed jobs and failed
+    attempts - as one set. A single UNION ALL on one pooled connection
+    replaces back-to-back get_processed_urls/get_failed_urls calls, and
+    the result rides the same TTL'd cache as the other URL sets.
+    """
+    def _load():
+        with get_db_connection() as conn:
+            with conn.cursor(row_factory=scalar_row) as cur:
+                cur.execute("""
+                    SELECT url FROM jobs WHERE url IS NOT NULL
+                    UNION ALL
+                    SELECT url FROM failed_urls
+                """)
+                return frozenset(cur)
+
+    return get_cached_url_set('skip', _load)
+
+
+class BloomFilter:
+    """
+    Compact membership sketch over a URL set: ~10 bits per URL at a 1%
+    false-positive rate, versus 100+ bytes per URL for a Python set.
+    A negative answer is exact; a positive one may be wrong, so callers
+    should confirm hits against the database (get_existing_urls).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        # Standard sizing: m = -n*ln(p)/ln(2)^2, k = (m/n)*ln(2)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher): two xxhash seeds derive
+        # all k probe positions
+        h1 = xxhash.xxh64(item, seed=0).intdigest()
+        h2 = xxhash.xxh64(item, seed=1).intdigest()
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(item)
+        )
+
+
+def get_processed_urls_bloom() -> BloomFilter:
+    """
+    Processed-URL membership as a Bloom filter, for deployments where
+    jobs has grown too large to hold the exact set in memory. Streams
+    urls off a scalar cursor so the full strings are never all resident.
+    """
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
+        with conn.cursor(row_factory=scalar_row) as cur:
+            cur.execute("SELECT COUNT(*) FROM jobs")
+            row_count = cur.fetchone()
+            bloom = BloomFilter(capacity=max(row_count * 2, 1024))
             cur.execute("SELECT url FROM jobs WHERE url IS NOT NULL")
-            rows = cur.fetchall()
-            return {row['url'] for row in rows}
+            for url in cur:
+                bloom.add(url)
+            return bloom
+
 
+def get_existing_urls(candidates: List[str]) -> Set[str]:
+    """
+    Membership check: which of `candidates` (query-stripped URLs) are
+    already saved as jobs?
 
-def filter_new_jobs(jobs: List[JobPosting], skip_failed: bool = True) -> List[JobPosting]:
+    Matches the url_base generated column through its index - O(batch)
+    probes instead of pulling the whole url column like
+    get_processed_urls does, and immune to tracking-param differences.
+    """
+    if not candidates:
+        return set()
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT url_base FROM jobs WHERE url_base = ANY(%s)",
+                (list(candidates),)
+            )
+            return {row['url_base'] for row in cur.fetchall()}
+
+
+def filter_new_jobs(jobs: List[JobPosting], skip_failed: bool = True,
+                    known_urls: Set[str] = None) -> List[JobPosting]:
     """
     Filter out jobs that have already been processed or have failed.
-    
+
     Args:
         jobs: List of job postings from GitHub
         skip_failed: If True, also skip URLs that previously failed to scrape
-        
+        known_urls: Optional in-memory set of URLs already handled by this
+            process (daemon mode); matching jobs are dropped before the
+            database is consulted at all
+
     Returns:
         List of jobs that haven't been processed yet
     """
-    processed_urls = get_processed_urls()
-    print(f"📊 Found {len(processed_urls)} already processed jobs in database")
-    
+    if known_urls:
+        before = len(jobs)
+        jobs = [
+            j for j in jobs
+            if j.apply_url not in known_urls and j.url_clean not in known_urls
+        ]
+        if len(jobs) < before:
+            print(f"✓ Skipped {before - len(jobs)} jobs already handled this session")
+
+    if not jobs:
+        return []
+
+    # The jobs table stores a query-stripped url_base server-side, so the
+    # processed check only needs the base form of each URL; failed_urls
+    # still holds raw URLs, so it's asked about both forms
+    bases = list({job.url_clean for job in jobs})
+    candidates = set(bases)
+    for job in jobs:
+        candidates.add(job.apply_url)
+
+    # One round-trip answers both membership questions: matches from the
+    # jobs table (by stored url_base) and from failed_urls (by raw url)
+    processed_bases = set()
     failed_urls = set()
-    if skip_failed:
-        failed_urls = get_failed_urls()
-        if failed_urls:
-            print(f"⚠️  Found {len(failed_urls)} previously failed URLs (skipping)")
-    
-    # Combine URLs to skip
-    skip_urls = processed_urls | failed_urls
-    
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT url_base AS url, TRUE AS processed
+                FROM jobs WHERE url_base = ANY(%s)
+                UNION ALL
+                SELECT url, FALSE
+                FROM failed_urls WHERE url = ANY(%s)
+            """, (bases, list(candidates) if skip_failed else []))
+            for row in cur.fetchall():
+                if row['processed']:
+                    processed_bases.add(row['url'])
+                else:
+                    failed_urls.add(row['url'])
+
+    print(f"📊 Found {len(processed_bases)} already processed jobs in database")
+    if failed_urls:
+        print(f"⚠️  Found {len(failed_urls)} previously failed URLs (skipping)")
+
+    # Nothing matched: every job is new, skip the per-job checks entirely
+    if not processed_bases and not failed_urls:
+        print(f"✓ Filtered: {len(jobs)} new jobs to process (0 processed, 0 failed)")
+        return list(jobs)
+
     # Filter out jobs whose URLs are already in the database or have failed
     new_jobs = []
+    skipped_processed = 0
     for job in jobs:
-        # Check both with and without query params
-        url_clean = job.apply_url.split('?')[0]
-        
-        if job.apply_url not in skip_urls and url_clean not in skip_urls:
-            new_jobs.append(job)
-    
-    skipped_processed = len([j for j in jobs if j.apply_url in processed_urls or j.apply_url.split('?')[0] in processed_urls])
+        if job.url_clean in processed_bases:
+            skipped_processed += 1
+            continue
+        if job.apply_url in failed_urls or job.url_clean in failed_urls:
+            continue
+        new_jobs.append(job)
+
     skipped_failed = len(jobs) - len(new_jobs) - skipped_processed
     print(f"✓ Filtered: {len(new_jobs)} new jobs to process ({skipped_processed} processed, {skipped_failed} failed)")
-    
+
     return new_jobs
 
 
@@ -69,73 +212,51 @@ def get_job_stats() -> dict:
     Returns:
         Dictionary with job statistics
     """
+    # The whole snapshot as one server-side json_build_object - a single
+    # parse/plan/round-trip instead of six statements, already shaped
+    # like the dict callers expect
+    query = """
+        SELECT json_build_object(
+            'total_jobs', (SELECT COUNT(*) FROM jobs),
+            'jobs_today', (
+                SELECT COUNT(*) FROM jobs WHERE created_at >= CURRENT_DATE
+            ),
+            'total_skills', (SELECT COUNT(*) FROM skills),
+            'top_companies', (
+                SELECT COALESCE(json_agg(t), '[]'::json) FROM (
+                    SELECT company AS name, COUNT(*) AS count
+                    FROM jobs
+                    WHERE company IS NOT NULL
+                    GROUP BY company
+                    ORDER BY count DESC
+                    LIMIT 10
+                ) t
+            ),
+            'top_skills', (
+                SELECT COALESCE(json_agg(t), '[]'::json) FROM (
+                    SELECT name, category, job_count
+                    FROM skill_counts_mv
+                    WHERE job_count > 0
+                    ORDER BY job_count DESC
+                    LIMIT 15
+                ) t
+            ),
+            'job_categories', (
+                SELECT COALESCE(json_agg(t), '[]'::json) FROM (
+                    SELECT category, COUNT(*) AS count
+                    FROM jobs
+                    WHERE category IS NOT NULL
+                    GROUP BY category
+                    ORDER BY count DESC
+                ) t
+            )
+        )
+    """
+
     with get_db_connection() as conn:
-        with conn.cursor() as cur:
-            # Total jobs
-            cur.execute("SELECT COUNT(*) as count FROM jobs")
-            total_jobs = cur.fetchone()['count']
-            
-            # Jobs by company (top 10)
-            cur.execute("""
-                SELECT company, COUNT(*) as count 
-                FROM jobs 
-                WHERE company IS NOT NULL
-                GROUP BY company 
-                ORDER BY count DESC 
-                LIMIT 10
-            """)
-            top_companies = cur.fetchall()
-            
-            # Total unique skills
-            cur.execute("SELECT COUNT(*) as count FROM skills")
-            total_skills = cur.fetchone()['count']
-            
-            # Top skills
-            cur.execute("""
-                SELECT s.name, s.category, COUNT(js.job_id) as job_count
-                FROM skills s
-                JOIN job_skills js ON s.id = js.skill_id
-                GROUP BY s.id, s.name, s.category
-                ORDER BY job_count DESC
-                LIMIT 15
-            """)
-            top_skills = cur.fetchall()
-            
-            # Jobs added today
-            cur.execute("""
-                SELECT COUNT(*) as count 
-                FROM jobs 
-                WHERE created_at >= CURRENT_DATE
-            """)
-            jobs_today = cur.fetchone()['count']
-            
-            # Jobs by category
-            cur.execute("""
-                SELECT category, COUNT(*) as count
-                FROM jobs
-                WHERE category IS NOT NULL
-                GROUP BY category
-                ORDER BY count DESC
-            """)
-            job_categories = cur.fetchall()
-            
-            return {
-                'total_jobs': total_jobs,
-                'jobs_today': jobs_today,
-                'total_skills': total_skills,
-                'top_companies': [
-                    {'name': r['company'], 'count': r['count']} 
-                    for r in top_companies
-                ],
-                'top_skills': [
-                    {'name': r['name'], 'category': r['category'], 'job_count': r['job_count']}
-                    for r in top_skills
-                ],
-                'job_categories': [
-                    {'category': r['category'], 'count': r['count']}
-                    for r in job_categories
-                ]
-            }
+        with conn.cursor(row_factory=scalar_row) as cur:
+            cur.execute(query)
+            return cur.fetchone()
 
 
 def print_stats():
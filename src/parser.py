@@ -1,7 +1,15 @@
+import asyncio
 import os
 import json
+import re
+
+import orjson
 from dotenv import load_dotenv
 from google import genai
+from bs4 import BeautifulSoup
+
+# Hard cap on text sent to (or held for) the LLM
+MAX_PARSE_CHARS = 200_000
 
 
 # 1. Load environment variables
@@ -14,13 +22,36 @@ if not api_key:
 # 2. Configure Gemini
 client = genai.Client(api_key=api_key)
 
-def parse_job_text(raw_text):
+def extract_main_content(raw_text: str) -> str:
     """
-    Sends raw job description text to Gemini and extracts structured skills.
+    Reduce a scraped page to the content that matters before it reaches
+    Gemini. Job pages typically bury <50KB of description inside hundreds
+    of KB of navigation/script boilerplate, so this cuts both LLM input
+    tokens and the memory held per in-flight job.
+
+    HTML gets a main-content extraction pass; markdown (from the browser
+    scraper) passes through. Everything is capped at MAX_PARSE_CHARS.
     """
+    head = raw_text[:5000].lower()
+    if '<html' in head or '<body' in head or '<div' in head:
+        try:
+            soup = BeautifulSoup(raw_text, 'lxml')
+            for tag in soup(['script', 'style', 'noscript', 'svg',
+                             'header', 'footer', 'nav']):
+                tag.decompose()
+            main = soup.find('main') or soup.find('article') or soup.body or soup
+            text = main.get_text(separator='\n', strip=True)
+            # Fall back to the raw page if extraction stripped too much
+            if len(text) > 200:
+                raw_text = text
+        except Exception:
+            pass
+    return raw_text[:MAX_PARSE_CHARS]
 
 
-    prompt = f"""
+# Constant part of the single-job prompt, built once at import time -
+# per call we only concatenate the job text onto the end
+PARSE_PROMPT = """
     You are an expert Tech Recruiter extracting SPECIFIC technical skills.
 
     RULES:
@@ -42,68 +73,65 @@ def parse_job_text(raw_text):
     - concepts: Methodologies only (Agile, CI/CD, OOP, REST, etc.) MAX 5
 
     Return ONLY a JSON object with this exact schema:
-    {{
+    {
       "job_title": "Extract the likely job title",
       "company": "Extract company name if present, else null",
-      "skills": {{
+      "skills": {
         "languages": ["Python, Java, C++, JavaScript, Go, TypeScript, etc."],
         "frameworks": ["Node.js, React, Spring Boot, Django, .NET, Express, etc."],
         "databases": ["PostgreSQL, MongoDB, Redis, MySQL, etc."],
         "tools": ["Linux, Git, Docker, AWS, Kubernetes, Jenkins, etc."],
         "concepts": ["Agile, CI/CD, OOP, REST, etc. MAX 5"]
-      }}
-    }}
+      }
+    }
 
     JOB DESCRIPTION:
-    {raw_text}
     """
 
+
+def _extract_json(text: str):
+    """
+    Locate and parse the JSON payload in a Gemini response with orjson.
+    Scanning for the outermost bracket/brace pair tolerates markdown
+    fences and stray prose around the payload, and orjson parses the
+    bytes directly - no Python-level slicing of big batch responses.
+    """
+    raw = text.encode()
+    obj_start = raw.find(b'{')
+    arr_start = raw.find(b'[')
+    if arr_start != -1 and (obj_start == -1 or arr_start < obj_start):
+        start, end = arr_start, raw.rfind(b']') + 1
+    else:
+        start, end = obj_start, raw.rfind(b'}') + 1
+    if start == -1 or end <= start:
+        raise ValueError("no JSON payload in response")
+    return orjson.loads(raw[start:end])
+
+
+def parse_job_text(raw_text, gemini_client=None):
+    """
+    Sends raw job description text to Gemini and extracts structured skills.
+    Uses the module-level client unless one is injected.
+    """
+    gemini_client = gemini_client or client
+    prompt = PARSE_PROMPT + raw_text
+
     try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash-lite', 
+        response = gemini_client.models.generate_content(
+            model='gemini-2.5-flash-lite',
             contents=prompt
         )
-        
-        cleaned_text = response.text.strip()
-        
-        # Handle cases where Gemini might still add markdown backticks
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-            
-        return json.loads(cleaned_text)
-        
+
+        return _extract_json(response.text)
+
     except Exception as e:
         print(f"Error parsing with Gemini: {e}")
         return None
 
 
-def parse_job_texts_batch(job_texts: list[tuple[str, str]]) -> list[dict]:
-    """
-    Parse multiple job descriptions in a SINGLE API call.
-    This maximizes your requests-per-day limit.
-    
-    Args:
-        job_texts: List of tuples (job_id, raw_text) where job_id is used to match results
-        
-    Returns:
-        List of parsed job dicts with 'job_id' field to match back to original
-    """
-    if not job_texts:
-        return []
-    
-    # Build the batch prompt
-    jobs_section = ""
-    for i, (job_id, raw_text) in enumerate(job_texts):
-        # Truncate very long descriptions to avoid token limits
-        truncated = raw_text[:8000] if len(raw_text) > 8000 else raw_text
-        jobs_section += f"""
----JOB {i+1} (ID: {job_id})---
-{truncated}
-"""
-
-    prompt = f"""
+# Constant part of the batch prompt, mirroring PARSE_PROMPT above -
+# per call we only append the numbered job sections
+BATCH_PARSE_PROMPT = """
 You are an expert Tech Recruiter extracting SPECIFIC technical skills from multiple job postings.
 
 RULES:
@@ -126,47 +154,90 @@ CATEGORY RULES (follow strictly):
 
 Return ONLY a JSON array with one object per job, in the same order as input:
 [
-  {{
+  {
     "job_id": "the ID from the input",
     "job_title": "Extract the likely job title",
     "company": "Extract company name if present, else null",
-    "skills": {{
+    "skills": {
       "languages": ["Python, Java, C++, JavaScript, Go, TypeScript, etc."],
       "frameworks": ["Node.js, React, Spring Boot, Django, .NET, Express, etc."],
       "databases": ["PostgreSQL, MongoDB, Redis, MySQL, etc."],
       "tools": ["Linux, Git, Docker, AWS, Kubernetes, Jenkins, etc."],
       "concepts": ["Agile, CI/CD, OOP, REST, etc. MAX 5"]
-    }}
-  }},
+    }
+  },
   ...
 ]
 
-HERE ARE {len(job_texts)} JOB DESCRIPTIONS TO PARSE:
-{jobs_section}
+HERE ARE THE JOB DESCRIPTIONS TO PARSE:
 """
 
+
+# Boilerplate lines that dominate crawl4ai markdown output and carry no
+# skill information; dropped before text is budgeted into the prompt
+_BOILERPLATE_PATTERN = re.compile(
+    r'(?mi)^\s*(cookies?\b|privacy policy|subscribe|follow us|sign in|log in|'
+    r'all rights reserved|©).*$'
+)
+
+# Rough chars-per-token ratio for English prose/markdown; good enough to
+# budget prompt input without pulling in a tokenizer dependency
+_CHARS_PER_TOKEN = 4
+MAX_TOKENS_PER_JOB = 2000
+
+
+def _trim_for_prompt(raw_text: str) -> str:
+    """
+    Strip boilerplate markdown lines, then cap the text at roughly
+    MAX_TOKENS_PER_JOB tokens so batches stay inside the context window
+    and don't spend their budget on navigation chrome.
+    """
+    text = _BOILERPLATE_PATTERN.sub('', raw_text)
+    limit = MAX_TOKENS_PER_JOB * _CHARS_PER_TOKEN
+    return text[:limit] if len(text) > limit else text
+
+
+def _build_batch_prompt(job_texts: list[tuple[str, str]]) -> str:
+    """
+    Assemble the batch prompt: the constant preamble plus one numbered,
+    boilerplate-stripped section per job.
+    """
+    sections = []
+    for i, (job_id, raw_text) in enumerate(job_texts):
+        # Drop boilerplate and cap by estimated tokens
+        truncated = _trim_for_prompt(raw_text)
+        sections.append(f"\n---JOB {i+1} (ID: {job_id})---\n{truncated}\n")
+    return BATCH_PARSE_PROMPT + ''.join(sections)
+
+
+def parse_job_texts_batch(job_texts: list[tuple[str, str]]) -> list[dict]:
+    """
+    Parse multiple job descriptions in a SINGLE API call.
+    This maximizes your requests-per-day limit.
+
+    Args:
+        job_texts: List of tuples (job_id, raw_text) where job_id is used to match results
+
+    Returns:
+        List of parsed job dicts with 'job_id' field to match back to original
+    """
+    if not job_texts:
+        return []
+
+    prompt = _build_batch_prompt(job_texts)
+
     try:
         response = client.models.generate_content(
             model='gemini-2.5-flash-lite', 
             contents=prompt
         )
         
-        cleaned_text = response.text.strip()
-        
-        # Handle markdown backticks
-        if cleaned_text.startswith("```json"):
-            cleaned_text = cleaned_text[7:]
-        elif cleaned_text.startswith("```"):
-            cleaned_text = cleaned_text[3:]
-        if cleaned_text.endswith("```"):
-            cleaned_text = cleaned_text[:-3]
-        
-        results = json.loads(cleaned_text.strip())
-        
+        results = _extract_json(response.text)
+
         # Ensure it's a list
         if isinstance(results, dict):
             results = [results]
-            
+
         return results
         
     except Exception as e:
@@ -174,6 +245,158 @@ HERE ARE {len(job_texts)} JOB DESCRIPTIONS TO PARSE:
         return []
 
 
+class _JsonArrayStream:
+    """
+    Incremental scanner for a JSON array arriving in chunks. feed() takes
+    each piece of response text as Gemini emits it and returns whatever
+    top-level array elements that piece completed, parsed with orjson.
+    Tracks string/escape state so braces inside values don't confuse the
+    nesting count, and ignores markdown fences and prose around the array.
+    """
+
+    def __init__(self):
+        self._buf: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False  # seen the array's opening '['
+
+    def feed(self, text: str) -> list[dict]:
+        items = []
+        for ch in text:
+            if not self._started:
+                if ch == '[':
+                    self._started = True
+                continue
+            if self._depth == 0:
+                # Between elements: wait for the next object to open
+                if ch == '{':
+                    self._depth = 1
+                    self._buf = [ch]
+                continue
+            self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(orjson.loads(''.join(self._buf)))
+                    except orjson.JSONDecodeError:
+                        pass
+                    self._buf = []
+        return items
+
+
+def parse_job_texts_batch_stream(job_texts: list[tuple[str, str]]):
+    """
+    Streaming variant of parse_job_texts_batch: same prompt and API
+    budget (still one call), but yields each parsed job dict the moment
+    Gemini finishes emitting it instead of blocking until the full array
+    has decoded. Callers can start saving early jobs while the model is
+    still working on the last ones.
+
+    Yields:
+        Parsed job dicts with 'job_id', in response order.
+    """
+    if not job_texts:
+        return
+
+    prompt = _build_batch_prompt(job_texts)
+    scanner = _JsonArrayStream()
+
+    try:
+        for chunk in client.models.generate_content_stream(
+            model='gemini-2.5-flash-lite',
+            contents=prompt
+        ):
+            if chunk.text:
+                yield from scanner.feed(chunk.text)
+    except Exception as e:
+        print(f"Error streaming batch parse with Gemini: {e}")
+
+
+class _ParseCoalescer:
+    """
+    Buffers concurrent parse_job_text_async calls and flushes them as a
+    single batched Gemini request once BATCH_SIZE jobs are waiting or
+    MAX_WAIT_SECONDS has passed. Callers just await their own result and
+    never see the batching; the per-RPC overhead (and the rate-limit
+    budget) is shared across the whole batch.
+    """
+    BATCH_SIZE = 10
+    MAX_WAIT_SECONDS = 0.2
+
+    def __init__(self):
+        self._queue = None
+        self._worker = None
+
+    async def parse(self, raw_text: str):
+        # Lazily bind to the running loop on first use
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((raw_text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block for the first request, then collect more until the
+            # batch is full or the wait window closes
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [(str(i), raw_text) for i, (raw_text, _) in enumerate(batch)]
+            try:
+                results = await asyncio.to_thread(parse_job_texts_batch, texts)
+            except Exception as e:
+                print(f"Error in coalesced parse: {e}")
+                results = []
+
+            by_index = {}
+            for parsed in results:
+                try:
+                    by_index[int(parsed.pop('job_id'))] = parsed
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result(by_index.get(i))
+
+
+_coalescer = _ParseCoalescer()
+
+
+async def parse_job_text_async(raw_text: str):
+    """
+    Parse one job description from async code. Concurrent callers are
+    coalesced into shared Gemini batch calls instead of paying one RPC
+    each; returns the parsed dict or None, like parse_job_text.
+    """
+    return await _coalescer.parse(raw_text)
+
+
 # TEST BLOCK
 if __name__ == "__main__":
     # Load the data we scraped in the previous step
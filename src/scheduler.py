@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from batch_processor import run_batch_pipeline
-from job_tracker import print_stats
+from job_tracker import print_stats, get_skip_set, get_processed_urls
 from db import init_db, clear_failed_urls, get_failed_urls
 
 
@@ -45,6 +45,11 @@ class JobScheduler:
         
         self._running = False
         self._next_run: Optional[datetime] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+        # Daemon mode only: URLs handled so far, seeded from the DB once
+        # and grown incrementally so repeat runs don't re-read the tables
+        self._known_urls: Optional[set] = None
     
     def _log(self, message: str):
         """Log a message with timestamp."""
@@ -67,9 +72,17 @@ class JobScheduler:
                 batch_size=self.batch_size,
                 max_concurrent=self.max_concurrent,
                 skip_existing=True,
-                skip_failed=self.skip_failed
+                skip_failed=self.skip_failed,
+                known_urls=self._known_urls
             )
-            
+
+            # Grow the daemon's skip set with what this run handled
+            # (failures too when we're not retrying them)
+            if self._known_urls is not None and results:
+                for r in results:
+                    if r.success or self.skip_failed:
+                        self._known_urls.add(r.job.apply_url)
+
             elapsed = (datetime.now() - start_time).total_seconds()
             
             stats = {
@@ -98,12 +111,16 @@ class JobScheduler:
         Handles graceful shutdown on SIGINT/SIGTERM.
         """
         self._running = True
-        
-        # Set up signal handlers for graceful shutdown
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        # Set up signal handlers for graceful shutdown; setting the event
+        # wakes the sleeping daemon immediately instead of on its next tick
         def signal_handler(signum, frame):
             self._log("Shutdown signal received, stopping after current run...")
             self._running = False
-        
+            loop.call_soon_threadsafe(self._stop_event.set)
+
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
@@ -115,8 +132,13 @@ class JobScheduler:
         self._log(f"   Max jobs/run: {self.max_jobs_per_run or 'unlimited'}")
         self._log("=" * 60)
         
+        # Seed the in-memory skip set once; run_once keeps it current so
+        # later runs skip known URLs without re-reading the tables
+        seed = get_skip_set() if self.skip_failed else get_processed_urls()
+        self._known_urls = set(seed)
+
         run_count = 0
-        
+
         while self._running:
             run_count += 1
             self._log(f"\nRun #{run_count}")
@@ -131,11 +153,16 @@ class JobScheduler:
             self._next_run = datetime.now() + timedelta(hours=self.interval_hours)
             self._log(f"Next run scheduled for: {self._next_run.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Sleep until next run (check every minute for shutdown signal)
-            sleep_seconds = self.interval_hours * 3600
-            while sleep_seconds > 0 and self._running:
-                await asyncio.sleep(min(60, sleep_seconds))
-                sleep_seconds -= 60
+            # Sleep until the next run with a single timer; a shutdown
+            # signal sets the event and ends the wait immediately
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=self.interval_hours * 3600
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
         
         self._log("Scheduler stopped gracefully")
 